@@ -1,14 +1,24 @@
 # Advanced URL Review Decoder - Streamlit App
-import re, time, json, math
+import importlib.machinery
+# Streamlit runs this file as a spec-less __main__, which spawn workers would re-execute on start-up.
+# A "__main__" spec tells multiprocessing there is nothing to re-import; the workers only need parsers.py.
+__spec__ = __spec__ or importlib.machinery.ModuleSpec("__main__", None, origin=__file__)
+import os, re, json, math, asyncio, logging, itertools
 from typing import List, Dict, Optional
-import requests, pandas as pd, streamlit as st
-from bs4 import BeautifulSoup
+import requests, aiohttp, numpy as np, pandas as pd, streamlit as st
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from parsers import clean_text, parse_amazon, parse_flipkart
 from fake_useragent import UserAgent
-from transformers import pipeline
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+import torch
+from transformers import pipeline, AutoTokenizer
+from wordcloud import WordCloud, STOPWORDS
 from collections import Counter
 from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 st.set_page_config(page_title="URL Review Decoder (Advanced)", layout="wide")
 st.title("🛒 URL Review Decoder — Advanced (Sentiment, Summary, WordCloud)")
@@ -23,86 +33,125 @@ def get_ua():
 
 HEADERS = lambda: {"User-Agent": get_ua(), "Accept-Language": "en-US,en;q=0.9"}
 
-def clean_text(s: Optional[str]) -> str:
-    if not s: return ""
-    return " ".join(s.replace("\xa0", " ").split())
+# shared keep-alive pool for the synchronous fetch path; retries 429/503 with backoff.
+# cache_resource keeps it alive across script reruns instead of rebuilding it each time.
+@st.cache_resource(show_spinner=False)
+def get_session() -> requests.Session:
+    s = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429,503]))
+    s.mount("https://", adapter); s.mount("http://", adapter)
+    return s
+
+MAX_PAGES = 25
+FETCH_CONCURRENCY = 10
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=20)
+
+async def _fetch_page(session: aiohttp.ClientSession, url: str, sem: asyncio.Semaphore) -> Optional[str]:
+    async with sem:
+        try:
+            async with session.get(url) as resp:
+                if resp.status!=200: return None
+                return await resp.text()
+        except Exception:
+            return None
+
+async def fetch_pages(session: aiohttp.ClientSession, urls: List[str]) -> List[Optional[str]]:
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+    return await asyncio.gather(*[_fetch_page(session, u, sem) for u in urls])
+
+PARSE_WORKERS = 4
+PARALLEL_PARSE_MIN_BYTES = 200_000
+
+@st.cache_resource(show_spinner=False)
+def get_parse_pool() -> ProcessPoolExecutor:
+    # spawn, not fork: the server process is multi-threaded (Tornado, other sessions, torch/ORT pools)
+    return ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=mp.get_context("spawn"))
+
+def parse_pages(parse, pages: List[str]):
+    # below ~200KB of HTML the process dispatch costs more than it saves
+    if sum(map(len, pages)) < PARALLEL_PARSE_MIN_BYTES:
+        return map(parse, pages)
+    try:
+        # materialise inside the try: worker/pickling failures only surface while iterating results
+        return list(get_parse_pool().map(parse, pages))
+    except Exception:
+        logging.warning("parse pool unavailable, parsing inline", exc_info=True)
+        get_parse_pool.clear()
+        return map(parse, pages)
 
-def polite_sleep():
-    time.sleep(0.5)
+# a page failed (non-200/timeout) before max_reviews was reached; carries what was parsed so far
+class PartialFetch(Exception):
+    def __init__(self, reviews: List[Dict]):
+        super().__init__(f"stopped after {len(reviews)} reviews on a failed page")
+        self.reviews = reviews
+
+def collect_batches(htmls: List[Optional[str]], parse, max_reviews: int) -> List[Dict]:
+    # pages come back in order; stop at the first missing/empty one like the old sequential loop did.
+    # an empty page is the real end of the reviews, a failed one (None) is reported as PartialFetch
+    pages=[]
+    for html in htmls:
+        if html is None: break
+        pages.append(html)
+    if not pages: return []
+    out = parse(pages[0])
+    if not out or len(out)>=max_reviews: return out[:max_reviews]
+    # size the rest from the first page so only the pages actually needed go to parse_pages;
+    # anything beyond that estimate is parsed lazily inline, only if later pages come up short
+    needed = math.ceil(max_reviews/len(out))
+    rest = pages[1:]
+    for batch in itertools.chain(parse_pages(parse, rest[:needed-1]), map(parse, rest[needed-1:])):
+        if not batch: break
+        out.extend(batch)
+        if len(out)>=max_reviews: break
+    else:
+        if len(pages)<len(htmls): raise PartialFetch(out)
+    return out[:max_reviews]
 
 # --------------- Scrapers ------------------
+GENERIC_SEL = "p,li,div"
+GENERIC_MIN_CHARS = 20
+_ASIN_RE = re.compile(r"/dp/([A-Z0-9]{10})")
+_ASIN_REVIEWS_RE = re.compile(r"/product-reviews/([A-Z0-9]{10})")
+_ASIN_JSON_RE = re.compile(r'"asin"\s*:\s*"([A-Z0-9]{10})"')
+_PAGE_RE = re.compile(r"page=\d+")
+
 class AmazonScraper:
     def _asin(self, url: str) -> str:
-        m = re.search(r"/dp/([A-Z0-9]{10})", url)
+        m = _ASIN_RE.search(url)
         if m: return m.group(1)
-        m = re.search(r"/product-reviews/([A-Z0-9]{10})", url)
+        m = _ASIN_REVIEWS_RE.search(url)
         if m: return m.group(1)
         return ""
     def _reviews_url(self, asin: str, page: int) -> str:
         return f"https://www.amazon.in/product-reviews/{asin}/ref=cm_cr_getr_d_paging_btm_next_{page}?pageNumber={page}"
     def _parse(self, html: str) -> List[Dict]:
-        soup = BeautifulSoup(html, "lxml")
-        out = []
-        for div in soup.select("div[data-hook='review']"):
-            body = div.select_one("span[data-hook='review-body']")
-            text = clean_text(body.get_text(" ")) if body else ""
-            rating_el = div.select_one("i[data-hook='review-star-rating'] span, i[data-hook='cmps-review-star-rating'] span")
-            rating = None
-            if rating_el:
-                m = re.search(r"([0-9.]+)\s+out of 5", rating_el.get_text())
-                if m:
-                    try: rating = float(m.group(1))
-                    except: rating = None
-            if text: out.append({"text": text, "rating": rating, "source": "amazon"})
-        return out
-    def fetch(self, url: str, max_reviews: int=200):
-        asin = self._asin(url)
-        if not asin:
-            r = requests.get(url, headers=HEADERS(), timeout=20)
-            if r.ok:
-                m = re.search(r'"asin"\s*:\s*"([A-Z0-9]{10})"', r.text)
+        return parse_amazon(html)
+    async def fetch_async(self, url: str, max_reviews: int=200):
+        async with aiohttp.ClientSession(headers=HEADERS(), timeout=FETCH_TIMEOUT) as s:
+            asin = self._asin(url)
+            if not asin:
+                html = await _fetch_page(s, url, asyncio.Semaphore(1))
+                m = _ASIN_JSON_RE.search(html) if html else None
                 if m: asin = m.group(1)
-        if not asin: return []
-        out=[]; page=1
-        while len(out)<max_reviews and page<=25:
-            try:
-                r = requests.get(self._reviews_url(asin,page), headers=HEADERS(), timeout=20)
-                if r.status_code!=200: break
-                batch = self._parse(r.text)
-                if not batch: break
-                out.extend(batch); page+=1; polite_sleep()
-            except Exception: break
-        return out[:max_reviews]
+            if not asin: return []
+            htmls = await fetch_pages(s, [self._reviews_url(asin,page) for page in range(1, MAX_PAGES+1)])
+        return collect_batches(htmls, parse_amazon, max_reviews)
+    def fetch(self, url: str, max_reviews: int=200):
+        return asyncio.run(self.fetch_async(url, max_reviews))
 
 class FlipkartScraper:
     def _url_with_page(self, url: str, page: int) -> str:
-        if "page=" in url: return re.sub(r"page=\\d+", f"page={page}", url)
+        if "page=" in url: return _PAGE_RE.sub(f"page={page}", url)
         sep = "&" if "?" in url else "?"
         return f"{url}{sep}page={page}"
     def _parse(self, html: str) -> List[Dict]:
-        soup = BeautifulSoup(html, "lxml"); out=[]
-        for blk in soup.select("div._27M-vq, div._1AtVbE"):
-            txt_el = blk.select_one("div.t-ZTKy, div._6K-7Co, div._2-N8zT")
-            if not txt_el: continue
-            text = clean_text(txt_el.get_text(" "))
-            if len(text.split())<4: continue
-            rating_el = blk.select_one("div._3LWZlK"); rating=None
-            if rating_el:
-                try: rating=float(clean_text(rating_el.get_text()))
-                except: rating=None
-            out.append({"text":text,"rating":rating,"source":"flipkart"})
-        return out
+        return parse_flipkart(html)
+    async def fetch_async(self, url: str, max_reviews: int=200):
+        async with aiohttp.ClientSession(headers=HEADERS(), timeout=FETCH_TIMEOUT) as s:
+            htmls = await fetch_pages(s, [self._url_with_page(url,page) for page in range(1, MAX_PAGES+1)])
+        return collect_batches(htmls, parse_flipkart, max_reviews)
     def fetch(self, url: str, max_reviews: int=200):
-        out=[]; page=1
-        while len(out)<max_reviews and page<=25:
-            try:
-                r = requests.get(self._url_with_page(url,page), headers=HEADERS(), timeout=20)
-                if r.status_code!=200: break
-                batch = self._parse(r.text)
-                if not batch: break
-                out.extend(batch); page+=1; polite_sleep()
-            except Exception: break
-        return out[:max_reviews]
+        return asyncio.run(self.fetch_async(url, max_reviews))
 
 class GenericScraper:
     def _looks_like_review(self, t: str) -> bool:
@@ -114,71 +163,176 @@ class GenericScraper:
     def fetch(self, url: str, max_reviews: int=200):
         out=[]
         try:
-            r = requests.get(url, headers=HEADERS(), timeout=20)
+            r = get_session().get(url, headers=HEADERS(), timeout=20)
             if r.status_code!=200: return []
-            soup = BeautifulSoup(r.text, "lxml")
-            for el in soup.select("p,li,div"):
-                text = clean_text(el.get_text(" "))
-                if self._looks_like_review(text):
-                    out.append({"text":text,"rating":None,"source":"generic"})
-                if len(out)>=max_reviews: break
+            tree = HTMLParser(r.text)
+            # walk innermost-first so a container whose child was already taken is skipped
+            # instead of re-extracting (and duplicating) the child's text
+            consumed=set()
+            for el in reversed(tree.css(GENERIC_SEL)):
+                if el.mem_id in consumed: continue
+                raw = el.text(separator=" ")
+                if len(raw) < GENERIC_MIN_CHARS: continue
+                text = clean_text(raw)
+                if not self._looks_like_review(text): continue
+                out.append({"text":text,"rating":None,"source":"generic"})
+                p = el.parent
+                while p is not None and p.mem_id not in consumed:
+                    consumed.add(p.mem_id); p = p.parent
         except Exception: return []
+        out.reverse()
         return out[:max_reviews]
 
-SCRAPERS = [(re.compile(r"amazon\\."), AmazonScraper), (re.compile(r"flipkart\\."), FlipkartScraper)]
+SCRAPERS = {"amazon": AmazonScraper, "flipkart": FlipkartScraper}
 
 def choose_scraper(url: str):
-    for rx, cls in SCRAPERS:
-        if rx.search(url): return cls()
+    # match on whole host labels so www.amazon.in, amazon.co.uk and dl.flipkart.com all hit
+    for label in (urlparse(url).hostname or "").split("."):
+        cls = SCRAPERS.get(label)
+        if cls: return cls()
     return GenericScraper()
 
 # --------------- Models (cached) ------------------
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"
+SENTIMENT_ONNX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "url-review-decoder", "sentiment-int8")
+SENTIMENT_ONNX_FILE = "model_quantized.onnx"
+
 @st.cache_resource(show_spinner=False)
-def load_models():
+def configure_torch():
+    # cached so it runs once per process: interop threads can only be set before parallel work starts
+    torch.set_num_threads(max(1, (os.cpu_count() or 1)-1))
+    try: torch.set_num_interop_threads(2)
+    except RuntimeError: pass
+    return True
+
+@st.cache_resource(show_spinner=False)
+def load_tokenizer(name: str):
+    return AutoTokenizer.from_pretrained(name, use_fast=True)
+
+def _quantized_sentiment_model():
+    # export + dynamic int8 quantization is slow, so it runs once and the result is kept on disk
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    if not os.path.exists(os.path.join(SENTIMENT_ONNX_DIR, SENTIMENT_ONNX_FILE)):
+        ort_model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL, export=True, provider="CPUExecutionProvider")
+        qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+        ORTQuantizer.from_pretrained(ort_model).quantize(save_dir=SENTIMENT_ONNX_DIR, quantization_config=qconfig)
+    return ORTModelForSequenceClassification.from_pretrained(SENTIMENT_ONNX_DIR, file_name=SENTIMENT_ONNX_FILE, provider="CPUExecutionProvider")
+
+@st.cache_resource(show_spinner=False)
+def load_sentiment():
+    configure_torch()
     try:
-        s_pipe = pipeline("sentiment-analysis", model="distilbert-base-uncased-finetuned-sst-2-english")
+        return pipeline("sentiment-analysis", model=_quantized_sentiment_model(), tokenizer=load_tokenizer(SENTIMENT_MODEL))
     except Exception:
-        s_pipe = pipeline("sentiment-analysis")
+        logging.warning("int8 ONNX sentiment model unavailable, falling back to PyTorch", exc_info=True)
     try:
-        sum_pipe = pipeline("summarization", model="facebook/bart-large-cnn")
+        return pipeline("sentiment-analysis", model=SENTIMENT_MODEL, tokenizer=load_tokenizer(SENTIMENT_MODEL))
     except Exception:
-        sum_pipe = pipeline("summarization")
-    return s_pipe, sum_pipe
+        return pipeline("sentiment-analysis")
 
-sentiment_pipe, summarizer_pipe = load_models()
+@st.cache_resource(show_spinner=False)
+def load_summarizer():
+    configure_torch()
+    try:
+        cuda = torch.cuda.is_available()
+        return pipeline("summarization", model=SUMMARIZER_MODEL, tokenizer=load_tokenizer(SUMMARIZER_MODEL),
+                        torch_dtype=torch.float16 if cuda else torch.float32, device=0 if cuda else -1)
+    except Exception:
+        return pipeline("summarization")
 
 # --------------- NLP helpers ------------------
-def label_reviews(reviews: List[Dict], batch_size: int=16):
-    if not reviews: return [], {"total":0,"positive":0,"negative":0,"positive_pct":0.0,"negative_pct":0.0}
+def default_batch_size(device) -> int:
+    # size by where the model actually runs: the ORT model stays on CPU even on a CUDA host
+    return 32 if getattr(device, "type", "cpu")=="cuda" else 8
+
+_STOPWORDS = frozenset(STOPWORDS)
+NEUTRAL_PRED = {"label":"NEUTRAL","score":0.0}
+
+def _is_real_review(t: str) -> bool:
+    # cheap boilerplate filter (nav/footer text) so it never reaches the sentiment model
+    words = t.lower().split()
+    if len(set(words)) < 6: return False
+    return sum(w in _STOPWORDS for w in words) <= 0.95*len(words)
+
+def _final_label(lbl: str) -> str:
+    lbl = lbl.upper()
+    if "NEUTRAL" in lbl: return "NEUTRAL"
+    return "NEGATIVE" if "NEG" in lbl else "POSITIVE"
+
+def label_reviews(reviews: List[Dict], batch_size: Optional[int]=None):
+    if not reviews: return [], {"total":0,"positive":0,"negative":0,"neutral":0,"positive_pct":0.0,"negative_pct":0.0}
+    sentiment_pipe = load_sentiment()
     texts = [r["text"] for r in reviews]
-    preds = sentiment_pipe(texts, batch_size=batch_size, truncation=True)
-    labeled=[]; pos=neg=0
-    for r,p in zip(reviews,preds):
-        lbl = p.get("label","").upper(); score=float(p.get("score",0.0))
-        if "NEG" in lbl: final="NEGATIVE"; neg+=1
-        else: final="POSITIVE"; pos+=1
-        rr = dict(r); rr["label"]=final; rr["score"]=score; labeled.append(rr)
-    total=len(labeled)
-    metrics={"total":total,"positive":pos,"negative":neg,"positive_pct":round(100*pos/total,2) if total else 0.0,"negative_pct":round(100*neg/total,2) if total else 0.0}
+    # only GenericScraper output can be page chrome; Amazon/Flipkart bodies are real reviews however short
+    keep = [i for i,r in enumerate(reviews) if r.get("source")!="generic" or _is_real_review(r["text"])]
+    # run in length order so each batch pads to a similar length, then restore the original order
+    order = sorted(keep, key=lambda i: len(texts[i]))
+    with torch.inference_mode():
+        preds_sorted = sentiment_pipe([texts[i] for i in order], batch_size=batch_size or default_batch_size(getattr(sentiment_pipe.model, "device", None)), truncation=True) if order else []
+    preds = [NEUTRAL_PRED]*len(texts)
+    for j,i in enumerate(order): preds[i]=preds_sorted[j]
+    labels = np.array([_final_label(p.get("label","")) for p in preds])
+    scores = np.fromiter((p.get("score",0.0) for p in preds), dtype=np.float64, count=len(preds))
+    neg = int((labels=="NEGATIVE").sum()); pos = int((labels=="POSITIVE").sum())
+    labeled = [{**r, "label":str(l), "score":float(sc)} for r,l,sc in zip(reviews,labels,scores)]
+    # "total" still counts every fetched review; skipped boilerplate is NEUTRAL and left out of the split
+    total=len(labeled); scored=pos+neg
+    metrics={"total":total,"positive":pos,"negative":neg,"neutral":total-scored,"positive_pct":round(100*pos/scored,2) if scored else 0.0,"negative_pct":round(100*neg/scored,2) if scored else 0.0}
     return labeled, metrics
 
-def summarize_reviews(texts: List[str], max_chars: int=4000):
+def summarize_reviews(texts: List[str], max_tokens: int=900):
     if not texts: return "No reviews to summarize."
-    blob = " ".join(texts)[:max_chars]
-    try:
-        out = summarizer_pipe(blob, max_length=180, min_length=50, do_sample=False)
-        if isinstance(out, list) and len(out): return out[0].get("summary_text","").strip()
-        return str(out)
-    except Exception as e:
-        return f"Summarization failed: {e}"
+    # failures propagate so the cached wrapper never stores them; the UI formats the message
+    summarizer_pipe = load_summarizer()
+    # budget the input in tokens (BART-family encoders top out at 1024) and stop encoding once it is full
+    tok = summarizer_pipe.tokenizer; ids=[]
+    for t in texts:
+        ids += tok.encode(" "+t, add_special_tokens=False)
+        if len(ids)>=max_tokens: break
+    blob = tok.decode(ids[:max_tokens]).strip()
+    with torch.inference_mode():
+        out = summarizer_pipe(blob, max_length=180, min_length=50, do_sample=False, num_beams=1)
+    if isinstance(out, list) and len(out): return out[0].get("summary_text","").strip()
+    return str(out)
+
+_TOK_RE = re.compile(r"[A-Za-z]{3,}")
 
 def make_wordcloud(texts: List[str], max_words:int=100):
-    joined = " ".join(texts)
-    if not joined.strip(): return None
+    freqs = Counter(w for t in texts for w in map(str.lower, _TOK_RE.findall(t)) if w not in _STOPWORDS).most_common(max_words)
+    if not freqs: return None
     wc = WordCloud(width=800, height=400, background_color="white", max_words=max_words)
-    wc.generate(joined)
+    wc.generate_from_frequencies(dict(freqs))
     return wc
 
+# --------------- Cached steps ------------------
+# widget tweaks rerun the whole script; memoize the expensive stages so e.g. the sample slider is free
+class NoReviewsFound(Exception):
+    pass
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def fetch_reviews(url: str, max_reviews: int):
+    reviews = choose_scraper(url).fetch(url, max_reviews=max_reviews)
+    # raising keeps blocked/empty fetches out of the cache (st.cache_data never stores exceptions);
+    # PartialFetch from collect_batches propagates the same way so a truncated list isn't pinned for the ttl
+    if not reviews: raise NoReviewsFound(url)
+    return reviews
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_sentiment(reviews: List[Dict]):
+    return label_reviews(reviews)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_summary(texts: List[str]):
+    return summarize_reviews(texts)
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def run_wordcloud(texts: List[str], max_words: int=100) -> Optional[np.ndarray]:
+    # cache the rendered bitmap rather than the WordCloud object; layout is the expensive part
+    wc = make_wordcloud(texts, max_words=max_words)
+    return wc.to_array() if wc else None
+
 # --------------- UI ---------------------------
 with st.sidebar:
     st.header("Run options")
@@ -191,45 +345,60 @@ if not url:
     st.info("Enter a product URL in the sidebar to begin.")
     st.stop()
 
-if run:
+if run: st.session_state["analyzed"] = (url, max_reviews)
+
+if st.session_state.get("analyzed") == (url, max_reviews):
     st.info("Fetching reviews (this may take time on first run while models download).")
     scraper = choose_scraper(url)
     st.write(f"Using scraper: **{scraper.__class__.__name__}**")
-    reviews = scraper.fetch(url, max_reviews=max_reviews)
-    if not reviews:
+    try:
+        reviews = fetch_reviews(url, max_reviews)
+    except PartialFetch as e:
+        reviews = e.reviews
+        st.warning(f"Some review pages failed to load (rate-limited or blocked); analyzing the first {len(reviews)} reviews. This fetch is not cached, so the next run retries.")
+    except NoReviewsFound:
+        st.session_state["analyzed"] = None  # wait for another Analyze click instead of refetching on every widget change
         st.error("No reviews found or site blocked the request. Try another URL or lower max_reviews.")
         st.stop()
     st.success(f"Fetched {len(reviews)} reviews. Running sentiment...")
-    labeled, metrics = label_reviews(reviews)
+    texts = [r['text'] for r in reviews]
+    # sentiment, summary and word cloud only share the review texts; torch releases the GIL
+    # during forward passes, so running them side by side costs max() rather than sum()
+    ex = ThreadPoolExecutor(max_workers=3, initializer=add_script_run_ctx, initargs=(None, get_script_run_ctx()))
+    f_sent = ex.submit(run_sentiment, reviews)
+    f_sum = ex.submit(run_summary, texts)
+    f_wc = ex.submit(run_wordcloud, texts, max_words=120)
+    ex.shutdown(wait=False)
+    labeled, metrics = f_sent.result()
     st.metric("Total", metrics["total"])
+    if metrics["neutral"]: st.caption(f"{metrics['neutral']} snippets looked like page boilerplate and were not scored.")
     c1, c2 = st.columns(2)
     c1.metric("Positive", f"{metrics['positive']} ({metrics['positive_pct']}%)")
     c2.metric("Negative", f"{metrics['negative']} ({metrics['negative_pct']}%)")
-    # pie
-    fig, ax = plt.subplots(figsize=(4,4))
-    ax.pie([metrics['positive'], metrics['negative']], labels=[f"Positive ({metrics['positive_pct']}%)", f"Negative ({metrics['negative_pct']}%)"], autopct='%1.1f%%', startangle=90)
-    ax.axis('equal')
-    st.pyplot(fig)
+    # sentiment split
+    st.bar_chart(pd.DataFrame({"count":[metrics['positive'], metrics['negative']]}, index=["Positive","Negative"]))
     # summary
     st.subheader("Summary")
-    summary = summarize_reviews([r['text'] for r in labeled])
-    st.write(summary)
+    try:
+        summary = f_sum.result()
+        st.write(summary)
+    except Exception as e:
+        summary = None
+        st.error(f"Summarization failed: {e}")
     # wordcloud
     st.subheader("Word Cloud (top words)")
-    wc = make_wordcloud([r['text'] for r in labeled], max_words=120)
-    if wc:
-        fig2, ax2 = plt.subplots(figsize=(8,4))
-        ax2.imshow(wc, interpolation='bilinear')
-        ax2.axis('off')
-        st.pyplot(fig2)
+    wc_img = f_wc.result()
+    if wc_img is not None:
+        st.image(wc_img)
     else:
         st.write("Not enough text for word cloud.")
     # sample table and downloads
     st.subheader("Sample reviews")
-    df = pd.DataFrame(labeled[:sample_count])
-    st.dataframe(df[['text','rating','label','score','source']])
+    df_all = pd.DataFrame(labeled, columns=['text','rating','label','score','source'])
+    st.dataframe(df_all.head(sample_count))
     # downloads
-    csv = pd.DataFrame(labeled).to_csv(index=False).encode('utf-8')
+    csv = df_all.to_csv(index=False, lineterminator='\n').encode('utf-8')
     st.download_button("Download CSV", csv, file_name="reviews.csv", mime="text/csv")
-    st.download_button("Download summary", summary.encode('utf-8'), file_name="summary.txt", mime="text/plain")
+    if summary is not None:
+        st.download_button("Download summary", summary.encode('utf-8'), file_name="summary.txt", mime="text/plain")
     st.download_button("Download metrics", json.dumps(metrics, indent=2).encode('utf-8'), file_name='metrics.json', mime='application/json')
@@ -0,0 +1,50 @@
+# Review page parsers - kept free of Streamlit/torch imports so parse-pool workers start cheaply
+import re
+from typing import List, Dict, Optional
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+_WS_RE = re.compile(r"\s+")
+
+def clean_text(s: Optional[str]) -> str:
+    if not s: return ""
+    if len(s) < 2: return s.strip()
+    # \s already covers \xa0, tabs and newlines, so one substitution normalises everything
+    return _WS_RE.sub(" ", s).strip()
+
+AMAZON_REVIEW_SEL = "div[data-hook='review']"
+AMAZON_BODY_SEL = "span[data-hook='review-body']"
+AMAZON_RATING_SEL = "i[data-hook='review-star-rating'] span, i[data-hook='cmps-review-star-rating'] span"
+FLIPKART_BLOCK_SEL = "div._27M-vq, div._1AtVbE"
+FLIPKART_TEXT_SEL = "div.t-ZTKy, div._6K-7Co, div._2-N8zT"
+FLIPKART_RATING_SEL = "div._3LWZlK"
+_RATING_RE = re.compile(r"([0-9.]+)\s+out of 5")
+
+def parse_amazon(html: str) -> List[Dict]:
+    tree = HTMLParser(html)
+    out = []
+    for div in tree.css(AMAZON_REVIEW_SEL):
+        body = div.css_first(AMAZON_BODY_SEL)
+        text = clean_text(body.text(separator=" ")) if body else ""
+        rating_el = div.css_first(AMAZON_RATING_SEL)
+        rating = None
+        if rating_el:
+            m = _RATING_RE.search(rating_el.text())
+            if m:
+                try: rating = float(m.group(1))
+                except: rating = None
+        if text: out.append({"text": text, "rating": rating, "source": "amazon"})
+    return out
+
+def parse_flipkart(html: str) -> List[Dict]:
+    tree = HTMLParser(html); out=[]
+    for blk in tree.css(FLIPKART_BLOCK_SEL):
+        txt_el = blk.css_first(FLIPKART_TEXT_SEL)
+        if not txt_el: continue
+        text = clean_text(txt_el.text(separator=" "))
+        if len(text.split())<4: continue
+        rating_el = blk.css_first(FLIPKART_RATING_SEL); rating=None
+        if rating_el:
+            try: rating=float(clean_text(rating_el.text()))
+            except: rating=None
+        out.append({"text":text,"rating":rating,"source":"flipkart"})
+    return out